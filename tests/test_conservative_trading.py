@@ -0,0 +1,235 @@
+# tests/test_conservative_trading.py
+"""Лимиты сделок пайплайна при параллельных решениях и перестройка счетчиков"""
+import importlib.machinery
+import importlib.util
+import os
+import sys
+import threading
+import time
+import types
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _load(name):
+    """Загрузка модуля репозитория (файлы без расширения .py)"""
+    loader = importlib.machinery.SourceFileLoader(name, os.path.join(ROOT, name))
+    spec = importlib.util.spec_from_loader(name, loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+class FakeQualityFilter:
+    def __init__(self, config):
+        self.config = config
+
+    def should_enter_trade(self, symbol, technical_data, primary_trend, entry_signal):
+        return True, ''
+
+
+class FakeGrokFilter:
+    def __init__(self, api_key):
+        self.api_key = api_key
+
+    def analyze_primary_trend(self, symbol, technical_data):
+        return {'trend': 'BULLISH'}
+
+    def close(self):
+        pass
+
+
+class FakeRiskManager:
+    def __init__(self, config):
+        self.config = config
+        self.daily_trades = 0
+        self.daily_pnl = 0.0
+        self.account_balance = 0.0
+
+    def can_trade_today(self, symbol):
+        if self.daily_trades >= self.config.DAILY_TRADE_LIMIT:
+            return False, 'Дневной лимит'
+        return True, ''
+
+    def set_account_balance(self, balance):
+        self.account_balance = balance
+
+    def calculate_position_size(self, **kwargs):
+        return 100.0
+
+    def update_trade_result(self, pnl):
+        self.daily_trades += 1
+        self.daily_pnl += pnl
+
+    def get_risk_summary(self):
+        return {
+            'daily_trades': self.daily_trades,
+            'daily_pnl': self.daily_pnl,
+            'consecutive_losses': 0,
+            'account_balance': self.account_balance
+        }
+
+    def reset_daily_stats(self):
+        self.daily_trades = 0
+        self.daily_pnl = 0.0
+
+
+class FakeExchange:
+    def load_markets(self):
+        return {}
+
+
+class FakeTrader:
+    """Биржа с задержкой ордера, чтобы исполнения в потоках перекрывались"""
+
+    def __init__(self, order_delay=0.05, fill=True):
+        self.exchange = FakeExchange()
+        self.order_delay = order_delay
+        self.fill = fill
+        self.orders = 0
+        self._lock = threading.Lock()
+
+    def get_account_info(self):
+        return {'total_balance': 1000.0}
+
+    def set_leverage(self, symbol, leverage):
+        pass
+
+    def create_order(self, symbol, order_type, side, amount, **kwargs):
+        time.sleep(self.order_delay)
+        if not self.fill:
+            return None
+        with self._lock:
+            self.orders += 1
+        return {'id': self.orders}
+
+
+class FakeSocialGuard:
+    def should_avoid_trade(self, symbol, context):
+        return False, ''
+
+
+config = _load('config')
+_core = types.ModuleType('conservative_core')
+_core.ConservativeQualityFilter = FakeQualityFilter
+_core.ConservativeGrokFilter = FakeGrokFilter
+_core.SmartHighLeverageRiskManager = FakeRiskManager
+sys.modules['conservative_core'] = _core
+conservative_trading = _load('conservative_trading')
+
+BTC, ETH, SOL, BNB = config.CONFIG.TRADING_PAIRS
+
+ANALYSIS = (
+    {
+        'entry': {'confidence': 0.9, 'action': 'BUY'},
+        'execution': {'current_price': 100.0},
+        'risk': {'atr': 1.0}
+    },
+    {'trend': 'BULLISH'}
+)
+LEVELS = (98.5, 103.0)
+
+
+class TradeLimitsTest(unittest.TestCase):
+
+    def setUp(self):
+        self._saved_config = config.CONFIG
+        self.trader = FakeTrader()
+        self.pipeline = conservative_trading.ConservativeTradingPipeline(
+            self.trader, None, FakeSocialGuard(), None
+        )
+
+    def tearDown(self):
+        self.pipeline.close()
+        config.CONFIG = self._saved_config
+
+    def _decide_concurrently(self, symbols):
+        with ThreadPoolExecutor(max_workers=len(symbols)) as executor:
+            futures = [executor.submit(self.pipeline._decide, symbol, ANALYSIS, LEVELS) for symbol in symbols]
+            return [future.result() for future in futures]
+
+    def _executed(self, decisions):
+        return sum(decision['action'] == 'EXECUTED' for decision in decisions)
+
+    def test_daily_limit_holds_under_concurrency(self):
+        config.update_config(DAILY_TRADE_LIMIT=3, MAX_TRADES_PER_SYMBOL=2)
+
+        decisions = self._decide_concurrently([BTC, ETH, SOL, BNB] * 2)
+
+        self.assertEqual(self._executed(decisions), 3)
+        self.assertEqual(self.trader.orders, 3)
+        self.assertEqual(self.pipeline.risk_manager.daily_trades, 3)
+        self.assertEqual(self.pipeline._pending_total, 0)
+        self.assertEqual(list(self.pipeline._sym_pending), [0, 0, 0, 0])
+
+    def test_symbol_limit_holds_under_concurrency(self):
+        config.update_config(DAILY_TRADE_LIMIT=10, MAX_TRADES_PER_SYMBOL=2)
+
+        decisions = self._decide_concurrently([BTC] * 6)
+
+        self.assertEqual(self._executed(decisions), 2)
+        self.assertEqual(self.pipeline.symbol_trade_count[BTC], 2)
+        self.assertEqual(self.pipeline._pending_total, 0)
+
+    def test_failed_order_releases_reservation(self):
+        self.trader.fill = False
+
+        decisions = self._decide_concurrently([BTC, ETH, SOL, BNB])
+
+        self.assertEqual(self._executed(decisions), 0)
+        self.assertEqual(self.pipeline._pending_total, 0)
+        self.assertEqual(list(self.pipeline._sym_pending), [0, 0, 0, 0])
+        self.assertEqual(self.pipeline.risk_manager.daily_trades, 0)
+
+
+class SyncConfigTest(unittest.TestCase):
+
+    def setUp(self):
+        self._saved_config = config.CONFIG
+        self.pipeline = conservative_trading.ConservativeTradingPipeline(
+            FakeTrader(order_delay=0), None, FakeSocialGuard(), None
+        )
+
+    def tearDown(self):
+        self.pipeline.close()
+        config.CONFIG = self._saved_config
+
+    def test_pairs_change_keeps_counts_of_remaining_symbols(self):
+        self.pipeline.record_trade_execution(BTC, 1.0)
+        self.pipeline.record_trade_execution(ETH, 1.0)
+        self.pipeline._reserve_trade_slot(BTC)
+
+        config.update_config(TRADING_PAIRS=(BTC, 'XRP/USDT:USDT'))
+        self.pipeline._sync_config()
+
+        self.assertEqual(self.pipeline.symbol_trade_count, {BTC: 1, 'XRP/USDT:USDT': 0})
+        self.assertEqual(list(self.pipeline._sym_pending), [1, 0])
+
+        # Резерв по символу переживает перестройку и снимается корректно
+        self.pipeline._release_trade_slot(BTC)
+        self.assertEqual(list(self.pipeline._sym_pending), [0, 0])
+        self.assertEqual(self.pipeline._pending_total, 0)
+
+    def test_release_of_removed_symbol(self):
+        self.pipeline._reserve_trade_slot(ETH)
+
+        config.update_config(TRADING_PAIRS=(BTC,))
+        self.pipeline._sync_config()
+        self.pipeline._release_trade_slot(ETH)
+
+        self.assertEqual(self.pipeline._pending_total, 0)
+        self.assertEqual(list(self.pipeline._sym_pending), [0])
+
+    def test_stats_follow_config_swap(self):
+        self.assertEqual(self.pipeline.get_pipeline_stats()['daily_trades'], '0/3')
+
+        config.update_config(DAILY_TRADE_LIMIT=5)
+
+        self.assertEqual(self.pipeline.get_pipeline_stats()['daily_trades'], '0/5')
+
+
+if __name__ == '__main__':
+    unittest.main()